@@ -3,102 +3,587 @@ XML extraction module for patent documents.
 
 This module provides functions to extract doc-number values from XML patent documents
 in priority order based on the format attribute. Handles XML embedded within larger text documents.
+
+Parsing uses lxml when it is installed and falls back to the standard library's ElementTree otherwise.
 """
 
-import xml.etree.ElementTree as ET
+import codecs
+import mmap
+import os
 import re
-from typing import List
+import sys
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import chain
+from typing import AnyStr, Dict, Iterable, List, Optional, Tuple, Union
 from pathlib import Path
 
+try:
+    from lxml import etree as ET
+    _HAS_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    _HAS_LXML = False
+
+
+# Tag, attribute and format names, interned once so comparisons against
+# them can short-circuit on identity
+_DOC_ID_TAG = sys.intern('document-id')
+_DOC_NUM_TAG = sys.intern('doc-number')
+_FORMAT_KEY = sys.intern('format')
+_EPO = sys.intern('epo')
+_PO = sys.intern('patent-office')
+
+# Size of the slices fed to the streaming parser
+_FEED_CHUNK_SIZE = 64 * 1024
+
+# Largest input, in characters or bytes, whose extract_doc_numbers result is
+# memoized; the memo keeps its inputs alive, so with 256 entries this bounds it
+# at 16 MiB of bytes or 64 MiB of the widest strings
+_MEMO_MAX_INPUT_SIZE = 64 * 1024
+
+# Most files handed to a worker process at once in extract_doc_numbers_from_files
+_BATCH_CHUNK_SIZE = 16
 
-def extract_xml_from_text(content: str) -> List[str]:
+# Patterns for locating XML inside surrounding text
+# Leading whitespace is limited to XML's own whitespace characters and is
+# skipped in place, without copying the content
+_XML_PREAMBLE_RE = re.compile(r'[ \t\r\n]*(<\?xml|<root)')
+_ROOT_OPEN = '<root'
+_ROOT_CLOSE = '</root>'
+# Byte-string counterparts, so raw file contents can be sliced without decoding
+_XML_PREAMBLE_BYTES_RE = re.compile(_XML_PREAMBLE_RE.pattern.encode())
+_ROOT_OPEN_BYTES = _ROOT_OPEN.encode()
+_ROOT_CLOSE_BYTES = _ROOT_CLOSE.encode()
+# Element that several snippets are fed inside so one parser reads them all
+_WRAPPER_OPEN = '<snippets>'
+_WRAPPER_CLOSE = '</snippets>'
+_WRAPPER_OPEN_BYTES = _WRAPPER_OPEN.encode()
+_WRAPPER_CLOSE_BYTES = _WRAPPER_CLOSE.encode()
+# Marker fed after each wrapped snippet; it must land directly inside the
+# wrapper, or the snippet left elements open that a later one closed
+_SNIPPET_END_TAG = sys.intern('snippet-end')
+_SNIPPET_END = f'<{_SNIPPET_END_TAG}/>'
+_SNIPPET_END_BYTES = _SNIPPET_END.encode()
+
+# Tags and patterns for the parser-free scan in scan_doc_numbers
+_DOC_ID_OPEN = '<document-id'
+_DOC_ID_CLOSE = '</document-id>'
+_FORMAT_ATTR_RE = re.compile(r'\sformat\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+_DOC_NUMBER_RE = re.compile(r'<doc-number(?:\s[^>]*)?>([^<]*)</doc-number>')
+
+# Byte order marks and the codecs that decode (and drop) them; UTF-32 comes
+# first since its little-endian mark starts with the UTF-16 one
+_BOM_ENCODINGS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+
+def extract_xml_from_text(content: AnyStr) -> List[AnyStr]:
     """
     Extract XML content from a text document that may contain other content.
     
-    Looks for <root>...</root> tags and extracts all XML portions.
+    Looks for <root>...</root> tags and extracts all XML portions. Content that
+    starts with <root> (or with an XML declaration) is pure XML unless another
+    <root> element follows the first </root>; if one does, the first portion
+    keeps the XML declaration.
     
     Args:
-        content: String that may contain XML along with other text
+        content: String or bytes that may contain XML along with other text
         
     Returns:
-        List of extracted XML strings. Returns list with original content if it appears to be pure XML.
+        List of extracted XML strings (bytes for bytes input). Returns list with original content if it appears to be pure XML.
     """
-    # First, try to see if the whole content is valid XML
-    content_stripped = content.strip()
-    if content_stripped.startswith('<?xml') or content_stripped.startswith('<root'):
-        return [content]
+    return [content[start:end] for start, end in _find_xml_spans(content)]
+
+
+def _find_xml_spans(content: AnyStr) -> List[Tuple[int, int]]:
+    """
+    Locate the XML documents in content without copying them out.
     
-    # Try to extract all XML snippets using regex - look for <root> tags
-    pattern = r'(<root[\s>].*?</root>)'
-    matches = re.findall(pattern, content, re.DOTALL)
+    Follows the rules of extract_xml_from_text, so parsing can read each
+    document straight from the original buffer.
     
-    if matches:
-        return matches
+    Args:
+        content: String or bytes that may contain XML along with other text
+        
+    Returns:
+        List of (start, end) offsets. A single span covering all of content if it
+        appears to be pure XML or no <root> snippet is found.
+    """
+    if isinstance(content, str):
+        preamble_re, root_close = _XML_PREAMBLE_RE, _ROOT_CLOSE
+    else:
+        preamble_re, root_close = _XML_PREAMBLE_BYTES_RE, _ROOT_CLOSE_BYTES
+    whole_content = [(0, len(content))]
     
     # If no <root> tag, return original content and let XML parser handle it
-    return [content]
+    open_at = _find_root_open(content, 0)
+    if open_at == -1:
+        return whole_content
+    
+    # Content that starts as XML is one document unless another <root> element
+    # follows the first </root>; a <root> nested inside the first one, or
+    # inside a comment there, doesn't split it
+    preamble = preamble_re.match(content)
+    if preamble:
+        first_close = content.find(root_close, open_at)
+        if first_close == -1 or _find_root_open(content, first_close + len(root_close)) == -1:
+            return whole_content
+    
+    # Scan for <root ...>...</root> windows with substring searches. Every
+    # search starts where the previous one stopped, so the content is walked
+    # once, with none of the backtracking a regex could fall into
+    spans = []
+    while open_at != -1:
+        close_at = content.find(root_close, open_at + len(_ROOT_OPEN))
+        if close_at == -1:
+            break
+        snippet_end = close_at + len(root_close)
+        spans.append((open_at, snippet_end))
+        open_at = _find_root_open(content, snippet_end)
+    
+    if not spans:
+        return whole_content
+    
+    # The first document keeps its XML declaration, so a declared encoding
+    # still reaches the parser
+    if preamble:
+        spans[0] = (preamble.start(1), spans[0][1])
+    return spans
 
 
-def extract_doc_numbers(xml_content: str) -> List[str]:
+def _find_root_open(content: AnyStr, pos: int) -> int:
+    """
+    Find the next <root> start tag in content at or after pos.
+    
+    Tags with a longer name that starts with root, such as <rootinfo/>, are
+    skipped.
+    
+    Args:
+        content: String or bytes to search
+        pos: Offset to start searching from
+        
+    Returns:
+        Offset of the tag, or -1 if there is none
+    """
+    if isinstance(content, str):
+        root_open, tag_end = _ROOT_OPEN, '>'
+    else:
+        root_open, tag_end = _ROOT_OPEN_BYTES, b'>'
+    
+    open_at = content.find(root_open, pos)
+    while open_at != -1:
+        name_end = open_at + len(root_open)
+        after_name = content[name_end:name_end + 1]
+        if after_name == tag_end or after_name.isspace():
+            return open_at
+        open_at = content.find(root_open, name_end)
+    return -1
+
+
+def _iter_document_ids(xml_str: Union[str, bytes], spans: List[Tuple[int, int]], prolog: Optional[AnyStr] = None):
+    """
+    Stream document-id elements out of the XML documents at spans of xml_str.
+    
+    The documents are read in place from the surrounding buffer and fed to a
+    pull parser in fixed-size slices, and each document-id is released once
+    the caller has consumed it, so only the elements still being parsed are
+    held in memory rather than the whole tree. Several documents are fed as
+    children of one wrapper element, so they share a single parser; a marker
+    after each one checks that it closed every element it opened.
+    
+    Args:
+        xml_str: String or bytes holding the XML documents; bytes are
+            decoded by the parser according to the XML declaration
+        spans: (start, end) offsets of the documents in xml_str
+        prolog: XML declaration and doctype to feed ahead of the documents, if
+            they were split off the first one
+        
+    Yields:
+        document-id elements in document order; a nested document-id follows
+        the one enclosing it
+        
+    Raises:
+        ET.ParseError: If XML parsing fails, or a wrapped document is only
+            balanced by the ones around it
+    """
+    parser, drain_document_ids = _new_document_id_reader()
+    if prolog:
+        parser.feed(prolog)
+    wrapped = len(spans) > 1
+    if wrapped:
+        wrapper_open, snippet_end, wrapper_close = (
+            (_WRAPPER_OPEN, _SNIPPET_END, _WRAPPER_CLOSE) if isinstance(xml_str, str)
+            else (_WRAPPER_OPEN_BYTES, _SNIPPET_END_BYTES, _WRAPPER_CLOSE_BYTES)
+        )
+        parser.feed(wrapper_open)
+    
+    for start, end in spans:
+        for chunk_start in range(start, end, _FEED_CHUNK_SIZE):
+            parser.feed(xml_str[chunk_start:min(chunk_start + _FEED_CHUNK_SIZE, end)])
+            yield from drain_document_ids()
+        if wrapped:
+            parser.feed(snippet_end)
+            yield from drain_document_ids()
+    if wrapped:
+        parser.feed(wrapper_close)
+    parser.close()
+    yield from drain_document_ids()
+
+
+# The per-element helpers are picked once at import time, keeping backend
+# checks out of the per-element loop
+if _HAS_LXML:
+    # Patent XML never relies on external DTDs or xml:id, so libxml2 is told
+    # to skip that work; entities declared in the internal subset are still
+    # expanded, as the standard library parser does, while external ones are
+    # never fetched. Whitespace-only text between elements is dropped during
+    # parsing instead of reaching Python, and comments and processing
+    # instructions are dropped as the standard library's tree builder does, so
+    # the text around them is joined into one .text
+    _PARSER_OPTIONS = {
+        'resolve_entities': 'internal',
+        'load_dtd': False,
+        'dtd_validation': False,
+        'no_network': True,
+        'huge_tree': False,
+        'collect_ids': False,
+        'remove_blank_text': True,
+        'remove_comments': True,
+        'remove_pis': True,
+    }
+    
+    def _new_document_id_reader():
+        """
+        Create a pull parser that reports document-id and snippet-end marker events only.
+        
+        Returns:
+            Tuple of the parser and a generator function draining its finished
+            document-ids in document order, releasing each after use
+        """
+        parser = ET.XMLPullParser(events=('start', 'end'), tag=(_DOC_ID_TAG, _SNIPPET_END_TAG), **_PARSER_OPTIONS)
+        # Start events are counted so a nested document-id, which ends before
+        # the one enclosing it, is reported along with its outermost one
+        open_document_ids = 0
+        nested = False
+        
+        def drain_document_ids():
+            nonlocal open_document_ids, nested
+            for event, elem in parser.read_events():
+                if elem.tag == _SNIPPET_END_TAG:
+                    if event == 'end':
+                        # The marker's parent is the wrapper only if the
+                        # snippet before it closed everything it opened
+                        wrapper = elem.getparent()
+                        if wrapper.getparent() is not None:
+                            raise ET.ParseError('snippet leaves elements open', 0, 0, 0)
+                        del wrapper[:]
+                    continue
+                if event == 'start':
+                    if open_document_ids:
+                        nested = True
+                    open_document_ids += 1
+                    continue
+                open_document_ids -= 1
+                if open_document_ids:
+                    continue
+                if nested:
+                    yield from elem.iter(_DOC_ID_TAG)
+                    nested = False
+                else:
+                    yield elem
+                elem.clear(keep_tail=True)
+                # Drop everything parsed before this element, at every level up
+                # to the root, so wrapper elements and unrelated subtrees don't
+                # pile up
+                node = elem
+                parent = node.getparent()
+                while parent is not None:
+                    while node.getprevious() is not None:
+                        del parent[0]
+                    node = parent
+                    parent = node.getparent()
+        
+        return parser, drain_document_ids
+    
+    def _doc_number_text(doc_id) -> Optional[str]:
+        """Return the raw text of the first doc-number child, or None if there is none."""
+        # A direct C-level walk over the children; evaluating an XPath per
+        # element costs more than the lookup itself
+        for doc_number_elem in doc_id.iterchildren(_DOC_NUM_TAG):
+            return doc_number_elem.text
+        return None
+else:
+    def _new_document_id_reader():
+        """
+        Create a pull parser that tracks the elements it has open.
+        
+        Returns:
+            Tuple of the parser and a generator function draining its finished
+            document-ids in document order, releasing each after use
+        """
+        parser = ET.XMLPullParser(events=('start', 'end'))
+        # ElementTree elements don't know their parent, so the chain of open
+        # elements is kept here for pruning
+        open_elements = []
+        open_document_ids = 0
+        
+        def drain_document_ids():
+            nonlocal open_document_ids
+            for event, elem in parser.read_events():
+                if event == 'start':
+                    open_elements.append(elem)
+                    if elem.tag == _DOC_ID_TAG:
+                        open_document_ids += 1
+                    continue
+                
+                open_elements.pop()
+                if elem.tag == _SNIPPET_END_TAG:
+                    # Only the wrapper is open after a snippet that closed
+                    # everything it opened
+                    if len(open_elements) != 1:
+                        raise ET.ParseError('snippet leaves elements open')
+                    del open_elements[0][:]
+                    continue
+                if elem.tag != _DOC_ID_TAG:
+                    continue
+                open_document_ids -= 1
+                # A nested document-id ends before the one enclosing it, so it
+                # is reported along with its outermost document-id instead
+                if open_document_ids:
+                    continue
+                yield from elem.iter(_DOC_ID_TAG)
+                elem.clear()
+                # Drop everything parsed before this element, at every level up
+                # to the root; each open element's last child is the next open
+                # one, and the parent's last child is this element
+                if open_elements:
+                    del open_elements[-1][:]
+                    for level in range(len(open_elements) - 1):
+                        del open_elements[level][:-1]
+        
+        return parser, drain_document_ids
+    
+    def _doc_number_text(doc_id) -> Optional[str]:
+        """Return the raw text of the first doc-number child, or None if there is none."""
+        doc_number_elem = doc_id.find(_DOC_NUM_TAG)
+        return None if doc_number_elem is None else doc_number_elem.text
+
+
+def extract_doc_numbers(xml_content: Union[str, bytes], skip_malformed: bool = False) -> List[str]:
     """
     Extract doc-number values from XML content in priority order.
     
     Handles XML embedded within larger text documents by first extracting the XML portion.
     If multiple XML snippets are found, aggregates results from all of them.
     
+    Results for str or bytes inputs of up to 64 KiB are memoized; call
+    extract_doc_numbers.cache_clear() to drop them.
+    
     Args:
-        xml_content: String containing XML document (may be embedded in other text, may contain multiple snippets)
+        xml_content: String or raw bytes containing XML document (may be embedded in other text, may contain multiple snippets).
+            Bytes are handed to the parser as-is, skipping a decode/re-encode round trip.
+        skip_malformed: If True, snippets that fail to parse are skipped instead of raising
         
     Returns:
         List of doc-number values, ordered by format priority (epo first, then patent-office)
         
     Raises:
-        ValueError: If XML parsing fails
+        ValueError: If XML parsing fails (naming the failing snippet when there are several)
     """
-    # Extract XML snippets from text
-    xml_snippets = extract_xml_from_text(xml_content)
+    # Results for repeated inputs come from a memo; large documents bypass it so
+    # the cache doesn't pin them in memory
+    if isinstance(xml_content, (str, bytes)) and len(xml_content) <= _MEMO_MAX_INPUT_SIZE:
+        return list(_memoized_extract_doc_numbers(xml_content, skip_malformed))
+    return _extract_doc_numbers(xml_content, skip_malformed)
+
+
+@lru_cache(maxsize=256)
+def _memoized_extract_doc_numbers(xml_content: Union[str, bytes], skip_malformed: bool) -> Tuple[str, ...]:
+    """Memoized extract_doc_numbers; returns a tuple so cached results can't be mutated."""
+    return tuple(_extract_doc_numbers(xml_content, skip_malformed))
+
+
+extract_doc_numbers.cache_clear = _memoized_extract_doc_numbers.cache_clear
+
+
+def _extract_doc_numbers(xml_content: Union[str, bytes], skip_malformed: bool) -> List[str]:
+    """Uncached implementation of extract_doc_numbers."""
+    # Locate XML snippets in the text; each is parsed in place rather than copied out
+    xml_spans = _find_xml_spans(xml_content)
+    
+    # A prolog opening the first of several snippets is split off and fed
+    # ahead of every parse, so each snippet is decoded with the declared
+    # encoding and sees the doctype's entity declarations
+    prolog = None
+    if len(xml_spans) > 1:
+        first_start, first_end = xml_spans[0]
+        root_at = _find_root_open(xml_content, first_start)
+        if root_at != first_start:
+            prolog = xml_content[first_start:root_at]
+            xml_spans[0] = (root_at, first_end)
+    
+    # Snippets are parsed together in one pass; only when that fails are they
+    # parsed one at a time, to name or skip the malformed one
+    if len(xml_spans) > 1:
+        try:
+            return list(chain(*_collect_doc_numbers(xml_content, xml_spans, prolog)))
+        except ET.ParseError:
+            pass
     
     # Collect doc-numbers from all snippets
-    all_epo_doc_numbers = []
-    all_patent_office_doc_numbers = []
-    all_other_doc_numbers = []
+    epo_doc_numbers = []
+    patent_office_doc_numbers = []
+    other_doc_numbers = []
     
-    for xml_str in xml_snippets:
+    for snippet_number, span in enumerate(xml_spans, 1):
         try:
-            root = ET.fromstring(xml_str)
+            snippet_buckets = _collect_doc_numbers(xml_content, [span], prolog)
         except ET.ParseError as e:
-            raise ValueError(f"Failed to parse XML: {e}")
+            # A malformed snippet contributes nothing, even if it yielded
+            # doc-numbers before failing
+            if skip_malformed:
+                continue
+            if len(xml_spans) > 1:
+                raise ValueError(f"Failed to parse XML snippet {snippet_number}/{len(xml_spans)}: {e}") from e
+            raise ValueError(f"Failed to parse XML: {e}") from e
+        if len(xml_spans) == 1:
+            # A lone snippet's buckets are already in priority order
+            return list(chain(*snippet_buckets))
+        snippet_epo, snippet_patent_office, snippet_other = snippet_buckets
+        epo_doc_numbers.extend(snippet_epo)
+        patent_office_doc_numbers.extend(snippet_patent_office)
+        other_doc_numbers.extend(snippet_other)
+    
+    # Return in priority order: epo, patent-office, others
+    return epo_doc_numbers + patent_office_doc_numbers + other_doc_numbers
+
+
+def _collect_doc_numbers(xml_content: Union[str, bytes], spans: List[Tuple[int, int]], prolog: Optional[AnyStr] = None) -> Tuple[List[str], List[str], List[str]]:
+    """
+    Collect the doc-numbers of the XML snippets at spans, bucketed by format.
+    
+    Args:
+        xml_content: String or bytes holding the snippets
+        spans: (start, end) offsets of the snippets in xml_content
+        prolog: XML declaration and doctype to feed ahead of the snippets
+        
+    Returns:
+        Tuple of (epo, patent-office, other) doc-number lists in document order
+        
+    Raises:
+        ET.ParseError: If XML parsing fails
+    """
+    epo_doc_numbers = []
+    patent_office_doc_numbers = []
+    other_doc_numbers = []
+    
+    # Categorize by format priority through a dict of bound appends, so each
+    # element costs one lookup rather than a chain of string comparisons
+    append_by_format = {_EPO: epo_doc_numbers.append, _PO: patent_office_doc_numbers.append}.get
+    append_other = other_doc_numbers.append
+    doc_number_text_of = _doc_number_text
+    
+    for doc_id in _iter_document_ids(xml_content, spans, prolog):
+        doc_number = doc_number_text_of(doc_id)
         
-        # Find all document-id elements
-        document_ids = root.findall('.//document-id')
+        # Skip if doc-number element doesn't exist or is empty
+        if not doc_number:
+            continue
         
-        for doc_id in document_ids:
-            format_attr = doc_id.get('format', '')
-            doc_number_elem = doc_id.find('doc-number')
-            
-            # Skip if doc-number element doesn't exist or is empty
-            if doc_number_elem is None or not doc_number_elem.text:
+        # Only strip when an edge is whitespace, so clean values aren't copied
+        if doc_number[0].isspace() or doc_number[-1].isspace():
+            # Skip whitespace-only doc-numbers before building a stripped copy
+            if doc_number.isspace():
                 continue
-                
-            doc_number = doc_number_elem.text.strip()
-            
-            # Categorize by format priority
-            if format_attr == 'epo':
-                all_epo_doc_numbers.append(doc_number)
-            elif format_attr == 'patent-office':
-                all_patent_office_doc_numbers.append(doc_number)
-            else:
-                # Handle other formats (lower priority)
-                all_other_doc_numbers.append(doc_number)
+            doc_number = doc_number.strip()
+        
+        append_by_format(doc_id.get(_FORMAT_KEY, ''), append_other)(doc_number)
+    
+    return epo_doc_numbers, patent_office_doc_numbers, other_doc_numbers
+
+
+def scan_doc_numbers(xml_content: str) -> List[str]:
+    """
+    Extract doc-number values with a single text scan, without parsing the XML.
+    
+    This is a fast path for trusted input that follows the flat
+    <document-id format="..."><doc-number>...</doc-number></document-id> layout.
+    The content is not validated, so malformed XML does not raise, and entity
+    references inside doc-number are returned undecoded. Use extract_doc_numbers
+    when either matters.
+    
+    Args:
+        xml_content: String containing XML (may be embedded in other text, may contain multiple snippets)
+        
+    Returns:
+        List of doc-number values, ordered by format priority (epo first, then patent-office)
+    """
+    epo_doc_numbers = []
+    patent_office_doc_numbers = []
+    other_doc_numbers = []
+    append_by_format = {_EPO: epo_doc_numbers.append, _PO: patent_office_doc_numbers.append}.get
+    append_other = other_doc_numbers.append
+    
+    # Walk <document-id ...>...</document-id> blocks with substring searches,
+    # like _find_xml_spans. A lazy regex would rescan to the end of the input
+    # for every unclosed opening tag; here, once no closing tag is left, no
+    # later block can match and the scan stops
+    open_at = xml_content.find(_DOC_ID_OPEN)
+    while open_at != -1:
+        name_end = open_at + len(_DOC_ID_OPEN)
+        after_name = xml_content[name_end:name_end + 1]
+        if after_name != '>' and not after_name.isspace():
+            # A longer tag name or a self-closing <document-id/>; keep looking
+            open_at = xml_content.find(_DOC_ID_OPEN, name_end)
+            continue
+        
+        tag_end = xml_content.find('>', name_end)
+        if tag_end == -1:
+            break
+        if xml_content[tag_end - 1] == '/':
+            # Self-closing, so there is no doc-number inside
+            open_at = xml_content.find(_DOC_ID_OPEN, tag_end)
+            continue
+        
+        close_at = xml_content.find(_DOC_ID_CLOSE, tag_end)
+        if close_at == -1:
+            break
+        open_at = xml_content.find(_DOC_ID_OPEN, close_at + len(_DOC_ID_CLOSE))
+        
+        # Search the attributes and body in place instead of slicing them out
+        doc_number_match = _DOC_NUMBER_RE.search(xml_content, tag_end, close_at)
+        if doc_number_match is None:
+            continue
+        
+        doc_number = doc_number_match.group(1).strip()
+        if not doc_number:
+            continue
+        
+        format_match = _FORMAT_ATTR_RE.search(xml_content, name_end, tag_end)
+        if format_match is None:
+            format_attr = ''
+        else:
+            format_attr = format_match.group(1) if format_match.group(1) is not None else format_match.group(2)
+        
+        append_by_format(format_attr, append_other)(doc_number)
     
     # Return in priority order: epo, patent-office, others
-    return all_epo_doc_numbers + all_patent_office_doc_numbers + all_other_doc_numbers
+    return epo_doc_numbers + patent_office_doc_numbers + other_doc_numbers
 
 
 def read_xml_file(file_path: Path) -> str:
     """
     Read XML content from a file with encoding fallback.
     
+    The file is read from disk once. A byte order mark selects the encoding
+    directly; otherwise UTF-8 is tried and latin-1 decodes the same bytes in memory.
+    
     Args:
         file_path: Path to the XML file
         
@@ -109,19 +594,39 @@ def read_xml_file(file_path: Path) -> str:
         FileNotFoundError: If the file doesn't exist
         ValueError: If the file cannot be read
     """
-    if not file_path.exists():
-        raise FileNotFoundError(f"File not found: {file_path}")
+    xml_bytes = read_xml_bytes(file_path)
+    encoding = 'utf-8'
+    for bom, bom_encoding in _BOM_ENCODINGS:
+        if xml_bytes.startswith(bom):
+            encoding = bom_encoding
+            break
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return f.read()
+        return xml_bytes.decode(encoding)
     except UnicodeDecodeError:
         # Try with a different encoding if UTF-8 fails
-        try:
-            with open(file_path, 'r', encoding='latin-1') as f:
-                return f.read()
-        except Exception as e:
-            raise ValueError(f"Failed to read file with any encoding: {e}")
+        return xml_bytes.decode('latin-1')
+
+
+def read_xml_bytes(file_path: Path) -> bytes:
+    """
+    Read raw XML bytes from a file, leaving decoding to the XML parser.
+    
+    Args:
+        file_path: Path to the XML file
+        
+    Returns:
+        Bytes containing the XML content
+        
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        ValueError: If the file cannot be read
+    """
+    # Let open() report a missing file rather than stat-ing it first
+    try:
+        return file_path.read_bytes()
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"File not found: {file_path}") from e
     except IOError as e:
         raise ValueError(f"Failed to read file: {e}")
 
@@ -130,6 +635,10 @@ def extract_doc_numbers_from_file(file_path: Path) -> List[str]:
     """
     Extract doc-number values from an XML file.
     
+    Results are cached per file and reused while the file's modification time,
+    size and inode are unchanged; call extract_doc_numbers_from_file.cache_clear()
+    to drop the cache.
+    
     Args:
         file_path: Path to the XML file
         
@@ -140,5 +649,118 @@ def extract_doc_numbers_from_file(file_path: Path) -> List[str]:
         FileNotFoundError: If the file doesn't exist
         ValueError: If XML parsing fails or file cannot be read
     """
-    xml_content = read_xml_file(file_path)
-    return extract_doc_numbers(xml_content)
+    try:
+        stat = file_path.stat()
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"File not found: {file_path}") from e
+    except IOError as e:
+        raise ValueError(f"Failed to read file: {e}")
+    
+    # Copy so callers can't mutate the cached result
+    return list(_cached_extract_doc_numbers_from_file(str(file_path), stat.st_mtime_ns, stat.st_size, stat.st_ino))
+
+
+@lru_cache(maxsize=1024)
+def _cached_extract_doc_numbers_from_file(path_str: str, mtime_ns: int, size: int, inode: int) -> Tuple[str, ...]:
+    """
+    Extract doc-number values from an XML file, memoized on its stat signature.
+    
+    mtime_ns, size and inode are only part of the cache key, so that an edited
+    or replaced file misses the cache. The file is memory-mapped rather than
+    read into a buffer, so the parser pulls pages from the OS page cache as it
+    goes.
+    
+    Args:
+        path_str: Path to the XML file
+        mtime_ns: Modification time of the file in nanoseconds
+        size: Size of the file in bytes
+        inode: Inode number of the file
+        
+    Returns:
+        Tuple of doc-number values in priority order
+        
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        ValueError: If XML parsing fails or file cannot be read
+    """
+    with _map_xml_file(Path(path_str)) as xml_buffer:
+        try:
+            return tuple(extract_doc_numbers(xml_buffer))
+        except ValueError:
+            # The parser rejects undeclared non-UTF-8 bytes; retry those as latin-1
+            # text, matching the fallback in read_xml_file
+            try:
+                str(xml_buffer, 'utf-8')
+            except UnicodeDecodeError:
+                return tuple(extract_doc_numbers(str(xml_buffer, 'latin-1')))
+            raise
+
+
+extract_doc_numbers_from_file.cache_clear = _cached_extract_doc_numbers_from_file.cache_clear
+
+
+@contextmanager
+def _map_xml_file(file_path: Path):
+    """
+    Memory-map an XML file read-only for the duration of the context.
+    
+    Args:
+        file_path: Path to the XML file
+        
+    Yields:
+        A read-only mmap of the file (empty bytes for an empty file, which can't be mapped)
+        
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        ValueError: If the file cannot be read
+    """
+    try:
+        xml_file = open(file_path, 'rb')
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"File not found: {file_path}") from e
+    except IOError as e:
+        raise ValueError(f"Failed to read file: {e}")
+    
+    with xml_file:
+        if os.fstat(xml_file.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(xml_file.fileno(), 0, access=mmap.ACCESS_READ) as xml_buffer:
+            yield xml_buffer
+
+
+def extract_doc_numbers_from_files(file_paths: Iterable[Path], workers: Optional[int] = None) -> Dict[Path, List[str]]:
+    """
+    Extract doc-number values from many XML files using a pool of worker processes.
+    
+    Each file is handled independently by extract_doc_numbers_from_file, so the
+    work spreads across cores without contending for the GIL. A single file, or
+    workers=1, is processed in the calling process.
+    
+    Args:
+        file_paths: Paths to the XML files
+        workers: Number of worker processes (defaults to the CPU count)
+        
+    Returns:
+        Mapping of each path to its doc-number values in priority order, in input order
+        
+    Raises:
+        FileNotFoundError: If a file doesn't exist
+        ValueError: If XML parsing fails or a file cannot be read
+    """
+    file_paths = list(file_paths)
+    if len(file_paths) < 2 or workers == 1:
+        return {file_path: extract_doc_numbers_from_file(file_path) for file_path in file_paths}
+    
+    # Hand out files in batches to cut inter-process round trips, while
+    # keeping enough batches for every worker to stay busy
+    worker_count = workers or os.cpu_count() or 1
+    chunksize = max(1, min(_BATCH_CHUNK_SIZE, len(file_paths) // (worker_count * 4)))
+    
+    # Imported here since it pulls in multiprocessing, which single-file
+    # callers such as the CLI never need
+    from concurrent.futures import ProcessPoolExecutor
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(extract_doc_numbers_from_file, file_paths, chunksize=chunksize)
+        return dict(zip(file_paths, results))
@@ -3,32 +3,38 @@
 XML Attribute Extraction for Patent Documents - CLI Entry Point
 
 This script provides a command-line interface for extracting doc-number values
-from XML patent documents. The actual extraction logic is in the extractor module.
+from XML patent documents. Several files can be given at once; they are processed
+in parallel worker processes. The actual extraction logic is in the extractor module.
 """
 
 import sys
 from pathlib import Path
-from extractor import extract_doc_numbers_from_file
+from extractor import extract_doc_numbers_from_files
 
 
 def main():
     """Main entry point for the script."""
     if len(sys.argv) < 2:
-        print("Usage: python main.py <xml_file_path>")
+        print("Usage: python main.py <xml_file_path> [<xml_file_path> ...]")
         print("Example: python main.py sample_patent.xml")
         sys.exit(1)
     
-    file_path = Path(sys.argv[1])
+    file_paths = [Path(arg) for arg in sys.argv[1:]]
     
     try:
-        doc_numbers = extract_doc_numbers_from_file(file_path)
+        results = extract_doc_numbers_from_files(file_paths)
         
-        if doc_numbers:
-            print("Extracted doc-numbers (in priority order):")
-            for doc_num in doc_numbers:
-                print(f"  {doc_num}")
-        else:
-            print("No doc-numbers found in the XML file.")
+        for file_path, doc_numbers in results.items():
+            # Label each file's output only when there is more than one
+            if len(results) > 1:
+                print(f"{file_path}:")
+            
+            if doc_numbers:
+                print("Extracted doc-numbers (in priority order):")
+                for doc_num in doc_numbers:
+                    print(f"  {doc_num}")
+            else:
+                print("No doc-numbers found in the XML file.")
             
     except FileNotFoundError as e:
         print(f"Error: {e}", file=sys.stderr)
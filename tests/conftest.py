@@ -0,0 +1,27 @@
+"""
+Shared fixtures for the extractor tests.
+"""
+
+import pytest
+
+
+@pytest.fixture(scope='module')
+def epo_po_xml():
+    """A document listing a patent-office doc-number before an epo one."""
+    return """<?xml version="1.0" encoding="UTF-8"?>
+        <root>
+            <application-reference>
+                <document-id format="patent-office">
+                    <doc-number>222222</doc-number>
+                </document-id>
+                <document-id format="epo">
+                    <doc-number>111111</doc-number>
+                </document-id>
+            </application-reference>
+        </root>"""
+
+
+@pytest.fixture(scope='module')
+def epo_po_xml_bytes(epo_po_xml):
+    """The epo_po_xml document encoded as UTF-8."""
+    return epo_po_xml.encode('utf-8')
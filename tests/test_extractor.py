@@ -10,8 +10,10 @@ Tests cover all extraction logic including:
 
 import pytest
 from pathlib import Path
-import tempfile
-from extractor import extract_doc_numbers, read_xml_file, extract_doc_numbers_from_file, extract_xml_from_text
+from extractor import (
+    extract_doc_numbers, read_xml_file, read_xml_bytes, extract_doc_numbers_from_file, extract_xml_from_text,
+    scan_doc_numbers, extract_doc_numbers_from_files,
+)
 
 
 class TestExtractDocNumbers:
@@ -156,6 +158,20 @@ class TestExtractDocNumbers:
         result = extract_doc_numbers(xml)
         assert result == ["111111"]
     
+    def test_extract_doc_number_around_comments(self):
+        """Test that comments and processing instructions inside doc-number are dropped."""
+        xml = """<root>
+            <document-id format="epo">
+                <doc-number><!--c--> 8</doc-number>
+            </document-id>
+            <document-id format="epo">
+                <doc-number>1<!--c-->2<?pi x?>3</doc-number>
+            </document-id>
+        </root>"""
+        
+        result = extract_doc_numbers(xml)
+        assert result == ["8", "123"]
+    
     def test_extract_no_matching_elements(self):
         """Test extraction returns empty list when no doc-numbers found."""
         xml = """<?xml version="1.0"?>
@@ -186,6 +202,24 @@ class TestExtractDocNumbers:
         result = extract_doc_numbers(xml)
         assert result == ["111111"]
     
+    def test_extract_document_id_inside_document_id(self):
+        """Test that a document-id nested in another is reported after the enclosing one."""
+        xml = """<?xml version="1.0"?>
+        <root>
+            <document-id format="epo">
+                <doc-number>OUTER</doc-number>
+                <document-id format="epo">
+                    <doc-number>INNER</doc-number>
+                </document-id>
+            </document-id>
+            <document-id format="epo">
+                <doc-number>NEXT</doc-number>
+            </document-id>
+        </root>"""
+        
+        result = extract_doc_numbers(xml)
+        assert result == ["OUTER", "INNER", "NEXT"]
+    
     def test_malformed_xml(self):
         """Test that malformed XML raises ValueError."""
         xml = """<root><unclosed>"""
@@ -193,6 +227,43 @@ class TestExtractDocNumbers:
         with pytest.raises(ValueError, match="Failed to parse XML"):
             extract_doc_numbers(xml)
     
+    def test_internal_entities_resolved(self):
+        """Test that entities declared in the document are expanded on either parser backend."""
+        xml = """<?xml version="1.0"?>
+        <!DOCTYPE root [<!ENTITY cc "EP">]>
+        <root>
+            <document-id format="epo">
+                <doc-number>&cc;123</doc-number>
+            </document-id>
+            <document-id format="epo">
+                <doc-number>456&cc;</doc-number>
+            </document-id>
+        </root>"""
+        
+        result = extract_doc_numbers(xml)
+        assert result == ["EP123", "456EP"]
+    
+    def test_external_entities_not_resolved(self, tmp_path: Path):
+        """Test that an external entity never pulls file contents into the result."""
+        secret_path = tmp_path / "secret.txt"
+        secret_path.write_text('SECRET', encoding='utf-8')
+        
+        xml = f"""<?xml version="1.0"?>
+        <!DOCTYPE root [<!ENTITY xxe SYSTEM "{secret_path.as_uri()}">]>
+        <root>
+            <document-id format="epo">
+                <doc-number>111111&xxe;</doc-number>
+            </document-id>
+        </root>"""
+        
+        # Depending on the parser the reference is dropped or rejected; either
+        # way the file contents must not leak into the result or the error
+        try:
+            outcome = repr(extract_doc_numbers(xml))
+        except ValueError as e:
+            outcome = str(e)
+        assert 'SECRET' not in outcome
+    
     def test_empty_xml(self):
         """Test that empty string raises ValueError."""
         with pytest.raises(ValueError):
@@ -220,6 +291,20 @@ class TestExtractDocNumbers:
         
         result = extract_doc_numbers(xml)
         assert result == ["999000888", "66667777"]
+    
+    def test_repeated_input_returns_independent_lists(self):
+        """Test that memoized results are returned as fresh lists."""
+        xml = """<root>
+            <document-id format="epo">
+                <doc-number>111111</doc-number>
+            </document-id>
+        </root>"""
+        
+        extract_doc_numbers(xml).append("mutated")
+        assert extract_doc_numbers(xml) == ["111111"]
+        
+        extract_doc_numbers.cache_clear()
+        assert extract_doc_numbers(xml) == ["111111"]
 
 
 class TestExtractXmlFromText:
@@ -313,6 +398,40 @@ class TestExtractXmlFromText:
         assert '<root id="test" version="1.0">' in xmls[0]
         assert 'preamble' not in xmls[0]
         assert 'epilogue' not in xmls[0]
+    
+    def test_extract_xml_nested_root_is_pure(self):
+        """Test that a <root> nested in the first one doesn't split pure XML."""
+        content = """<?xml version="1.0"?><root><root><document-id format="epo"><doc-number>1</doc-number></document-id></root></root>"""
+        
+        assert extract_xml_from_text(content) == [content]
+        assert extract_doc_numbers(content) == ["1"]
+    
+    def test_extract_xml_longer_root_names_are_pure(self):
+        """Test that <rootinfo/> or a commented <root> keeps the declared encoding."""
+        template = """<?xml version="1.0" encoding="windows-1252"?>
+        <root>
+            %s
+            <document-id format="epo">
+                <doc-number>€12</doc-number>
+            </document-id>
+        </root>"""
+        
+        for extra in ('', '<rootinfo/>', '<!-- <root> -->'):
+            content = (template % extra).encode('cp1252')
+            assert extract_xml_from_text(content) == [content]
+            assert extract_doc_numbers(content) == ["€12"]
+    
+    def test_extract_xml_multiple_roots_keep_declaration(self):
+        """Test that the first of several root elements keeps the XML declaration."""
+        content = """<?xml version="1.0"?>
+        <root><document-id format="epo"><doc-number>1</doc-number></document-id></root>
+        <root><document-id format="epo"><doc-number>2</doc-number></document-id></root>"""
+        
+        xmls = extract_xml_from_text(content)
+        assert len(xmls) == 2
+        assert xmls[0].startswith('<?xml version="1.0"?>')
+        assert xmls[1].startswith('<root>')
+        assert extract_doc_numbers(content) == ["1", "2"]
 
 
 class TestExtractDocNumbersFromEmbeddedXml:
@@ -445,47 +564,306 @@ class TestExtractDocNumbersFromMultipleSnippets:
         result = extract_doc_numbers(content)
         # All epo first (from both snippets), then all patent-office (from both snippets)
         assert result == ["111111", "333333", "222222", "444444"]
+    
+    def test_malformed_snippet_is_named(self):
+        """Test that a parse failure reports which snippet was malformed."""
+        content = """
+        Snippet 1:
+        <root>
+            <document-id format="epo">
+                <doc-number>111111</doc-number>
+            </document-id>
+        </root>
+        
+        Snippet 2:
+        <root><unclosed></root>
+        
+        Snippet 3:
+        <root>
+            <document-id format="epo">
+                <doc-number>222222</doc-number>
+            </document-id>
+        </root>
+        """
+        
+        with pytest.raises(ValueError, match="Failed to parse XML snippet 2/3"):
+            extract_doc_numbers(content)
+    
+    def test_skip_malformed_snippets(self):
+        """Test that skip_malformed drops bad snippets and keeps the rest."""
+        content = """
+        Snippet 1:
+        <root>
+            <document-id format="patent-office">
+                <doc-number>222222</doc-number>
+            </document-id>
+        </root>
+        
+        Snippet 2:
+        <root>
+            <document-id format="epo">
+                <doc-number>999999</doc-number>
+            </document-id>
+            <unclosed>
+        </root>
+        
+        Snippet 3:
+        <root>
+            <document-id format="epo">
+                <doc-number>111111</doc-number>
+            </document-id>
+        </root>
+        """
+        
+        result = extract_doc_numbers(content, skip_malformed=True)
+        assert result == ["111111", "222222"]
+    
+    def test_many_snippets_merged_in_snippet_order(self):
+        """Test that the doc-numbers of many snippets are merged in snippet order."""
+        content = "".join(
+            f"""
+        Snippet {i}:
+        <root>
+            <document-id format="{'epo' if i % 2 else 'patent-office'}">
+                <doc-number>{i}</doc-number>
+            </document-id>
+        </root>
+        """
+            for i in range(6)
+        )
+        
+        assert extract_doc_numbers(content) == ["1", "3", "5", "0", "2", "4"]
+        
+        malformed = content.replace("<doc-number>3</doc-number>", "<doc-number>3</doc-number><unclosed>")
+        with pytest.raises(ValueError, match="Failed to parse XML snippet 4/6"):
+            extract_doc_numbers(malformed)
+        assert extract_doc_numbers(malformed, skip_malformed=True) == ["1", "5", "0", "2", "4"]
+    
+    def test_snippets_balanced_only_together_are_malformed(self):
+        """Test that snippets which only balance once joined are each rejected."""
+        content = (
+            'intro <root><document-id format="epo"><doc-number>1</doc-number></document-id><root></root>'
+            ' prose <root /><document-id format="epo"><doc-number>2</doc-number></document-id></root>'
+        )
+        
+        with pytest.raises(ValueError, match="Failed to parse XML snippet 1/2"):
+            extract_doc_numbers(content)
+
+
+class TestExtractDocNumbersFromBytes:
+    """Tests for extracting doc-numbers from raw bytes."""
+    
+    def test_extract_from_bytes(self):
+        """Test that bytes input gives the same result as text input."""
+        xml = """<?xml version="1.0" encoding="UTF-8"?>
+        <root>
+            <document-id format="patent-office">
+                <doc-number>222222</doc-number>
+            </document-id>
+            <document-id format="epo">
+                <doc-number>111111</doc-number>
+            </document-id>
+        </root>"""
+        
+        assert extract_doc_numbers(xml.encode('utf-8')) == extract_doc_numbers(xml) == ["111111", "222222"]
+    
+    def test_extract_shared_document_from_bytes(self, epo_po_xml, epo_po_xml_bytes):
+        """Test that the shared patent-office-first document gives the same result as bytes and text."""
+        assert extract_doc_numbers(epo_po_xml_bytes) == extract_doc_numbers(epo_po_xml) == ["111111", "222222"]
+    
+    def test_extract_from_bytes_with_declared_encoding(self):
+        """Test that bytes are decoded according to the XML declaration."""
+        xml = """<?xml version="1.0" encoding="ISO-8859-1"?>
+        <root>
+            <document-id format="epo">
+                <doc-number>ABé123</doc-number>
+            </document-id>
+        </root>"""
+        
+        result = extract_doc_numbers(xml.encode('latin-1'))
+        assert result == ["ABé123"]
+    
+    def test_extract_from_bytes_with_embedded_snippets(self):
+        """Test that XML snippets embedded in text are found in bytes input."""
+        content = b"""
+        Patent 1:
+        <root>
+            <document-id format="patent-office">
+                <doc-number>222222</doc-number>
+            </document-id>
+        </root>
+        
+        Patent 2:
+        <root>
+            <document-id format="epo">
+                <doc-number>111111</doc-number>
+            </document-id>
+        </root>
+        """
+        
+        assert extract_xml_from_text(content)[0].startswith(b'<root>')
+        assert extract_doc_numbers(content) == ["111111", "222222"]
+    
+    def test_extract_from_bytes_snippets_with_declared_encoding(self):
+        """Test that every snippet is decoded with the encoding declared before the first one."""
+        content = """<?xml version="1.0" encoding="windows-1252"?>
+        <root>
+            <document-id format="patent-office">
+                <doc-number>€222</doc-number>
+            </document-id>
+        </root>
+        <root>
+            <document-id format="epo">
+                <doc-number>€111</doc-number>
+            </document-id>
+        </root>""".encode('cp1252')
+        
+        assert extract_doc_numbers(content) == ["€111", "€222"]
+
+
+class TestScanDocNumbers:
+    """Tests for scan_doc_numbers function."""
+    
+    def test_scan_matches_parser_on_sample(self):
+        """Test that the regex scan agrees with the parser on the challenge sample."""
+        xml = Path(__file__).parent.parent.joinpath('sample_patent.xml').read_text(encoding='utf-8')
+        
+        assert scan_doc_numbers(xml) == extract_doc_numbers(xml) == ["999000888", "66667777"]
+    
+    def test_scan_priority_order(self, epo_po_xml):
+        """Test that the regex scan applies the same priority order as the parser."""
+        assert scan_doc_numbers(epo_po_xml) == extract_doc_numbers(epo_po_xml) == ["111111", "222222"]
+    
+    def test_scan_priority_across_embedded_snippets(self):
+        """Test priority ordering across XML snippets embedded in text."""
+        content = """
+        Snippet 1:
+        <root>
+            <document-id format="patent-office">
+                <doc-number>222222</doc-number>
+            </document-id>
+            <document-id>
+                <doc-number>999999</doc-number>
+            </document-id>
+        </root>
+        
+        Snippet 2:
+        <root>
+            <document-id load-source="docdb" format='epo'>
+                <doc-number> 111111 </doc-number>
+            </document-id>
+        </root>
+        """
+        
+        result = scan_doc_numbers(content)
+        assert result == ["111111", "222222", "999999"]
+    
+    def test_scan_skips_empty_and_missing_doc_numbers(self):
+        """Test that empty, whitespace-only, and missing doc-numbers are skipped."""
+        xml = """<root>
+            <document-id format="epo"><doc-number></doc-number></document-id>
+            <document-id format="epo"><doc-number>   </doc-number></document-id>
+            <document-id format="epo"><country>US</country></document-id>
+            <document-id format="epo"/>
+            <document-id format="patent-office"><doc-number>222222</doc-number></document-id>
+        </root>"""
+        
+        result = scan_doc_numbers(xml)
+        assert result == ["222222"]
+    
+    def test_scan_does_not_validate(self):
+        """Test that malformed XML is scanned rather than rejected."""
+        xml = """<root><document-id format="epo"><doc-number>111111</doc-number></document-id>"""
+        
+        assert scan_doc_numbers(xml) == ["111111"]
+    
+    def test_scan_unclosed_document_ids_stay_linear(self):
+        """Test that many unclosed document-id tags don't make the scan quadratic."""
+        class CountingStr(str):
+            """str that tallies the characters its find() calls pass over."""
+            scanned = 0
+            
+            def find(self, sub, start=0, end=None):
+                found = super().find(sub, start, end)
+                CountingStr.scanned += (len(self) if found == -1 else found + len(sub)) - start
+                return found
+        
+        xml = '<document-id format="epo">' * 50000 + '<document-id format="epo"><doc-number>111111</doc-number>'
+        
+        assert scan_doc_numbers(CountingStr(xml)) == []
+        # A quadratic scan passes over the rest of the input once per opening tag
+        assert CountingStr.scanned <= 2 * len(xml)
 
 
+@pytest.mark.xdist_group("fs")
 class TestReadXmlFile:
     """Tests for read_xml_file function."""
     
-    def test_read_utf8_file(self):
+    def test_read_utf8_file(self, tmp_path: Path):
         """Test reading a UTF-8 encoded XML file."""
-        with tempfile.NamedTemporaryFile(mode='w', encoding='utf-8', delete=False, suffix='.xml') as f:
-            f.write('<?xml version="1.0"?><root><test>data</test></root>')
-            temp_path = Path(f.name)
+        temp_path = tmp_path / "test.xml"
+        temp_path.write_text('<?xml version="1.0"?><root><test>data</test></root>', encoding='utf-8')
         
-        try:
-            content = read_xml_file(temp_path)
-            assert '<root>' in content
-            assert '<test>data</test>' in content
-        finally:
-            temp_path.unlink()
+        content = read_xml_file(temp_path)
+        assert '<root>' in content
+        assert '<test>data</test>' in content
     
     def test_read_nonexistent_file(self):
         """Test that reading nonexistent file raises FileNotFoundError."""
         with pytest.raises(FileNotFoundError, match="File not found"):
             read_xml_file(Path("/nonexistent/file.xml"))
     
-    def test_read_latin1_file(self):
+    def test_read_latin1_file(self, tmp_path: Path):
         """Test reading a Latin-1 encoded file (fallback)."""
-        with tempfile.NamedTemporaryFile(mode='w', encoding='latin-1', delete=False, suffix='.xml') as f:
-            # Write some latin-1 specific character
-            f.write('<?xml version="1.0"?><root><test>café</test></root>')
-            temp_path = Path(f.name)
+        temp_path = tmp_path / "test.xml"
+        # Write some latin-1 specific character
+        temp_path.write_text('<?xml version="1.0"?><root><test>café</test></root>', encoding='latin-1')
         
-        try:
-            content = read_xml_file(temp_path)
-            assert '<root>' in content
-        finally:
-            temp_path.unlink()
+        content = read_xml_file(temp_path)
+        assert '<root>' in content
+    
+    def test_read_utf8_bom_file(self, tmp_path: Path):
+        """Test that a UTF-8 byte order mark is stripped."""
+        temp_path = tmp_path / "test.xml"
+        temp_path.write_text('<?xml version="1.0"?><root><test>café</test></root>', encoding='utf-8-sig')
+        
+        content = read_xml_file(temp_path)
+        assert content.startswith('<?xml')
+        assert 'café' in content
+    
+    def test_read_utf16_file(self, tmp_path: Path):
+        """Test reading a UTF-16 file identified by its byte order mark."""
+        temp_path = tmp_path / "test.xml"
+        temp_path.write_text('<?xml version="1.0" encoding="UTF-16"?><root><test>café</test></root>', encoding='utf-16')
+        
+        content = read_xml_file(temp_path)
+        assert content.startswith('<?xml')
+        assert '<test>café</test>' in content
 
 
+@pytest.mark.xdist_group("fs")
+class TestReadXmlBytes:
+    """Tests for read_xml_bytes function."""
+    
+    def test_read_bytes_unchanged(self, tmp_path: Path):
+        """Test that file contents are returned undecoded."""
+        data = '<?xml version="1.0" encoding="ISO-8859-1"?><root><test>café</test></root>'.encode('latin-1')
+        temp_path = tmp_path / "test.xml"
+        temp_path.write_bytes(data)
+        
+        assert read_xml_bytes(temp_path) == data
+    
+    def test_read_bytes_nonexistent_file(self):
+        """Test that reading nonexistent file raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError, match="File not found"):
+            read_xml_bytes(Path("/nonexistent/file.xml"))
+
+
+@pytest.mark.xdist_group("fs")
 class TestExtractDocNumbersFromFile:
     """Tests for extract_doc_numbers_from_file function."""
     
-    def test_extract_from_valid_file(self):
+    def test_extract_from_valid_file(self, tmp_path: Path):
         """Test extraction from a valid XML file."""
         xml_content = """<?xml version="1.0"?>
         <root>
@@ -497,41 +875,137 @@ class TestExtractDocNumbersFromFile:
             </document-id>
         </root>"""
         
-        with tempfile.NamedTemporaryFile(mode='w', encoding='utf-8', delete=False, suffix='.xml') as f:
-            f.write(xml_content)
-            temp_path = Path(f.name)
+        temp_path = tmp_path / "test.xml"
+        temp_path.write_text(xml_content, encoding='utf-8')
         
-        try:
-            result = extract_doc_numbers_from_file(temp_path)
-            assert result == ["111111", "222222"]
-        finally:
-            temp_path.unlink()
+        result = extract_doc_numbers_from_file(temp_path)
+        assert result == ["111111", "222222"]
+    
+    def test_extract_from_patent_office_first_file(self, tmp_path: Path, epo_po_xml_bytes):
+        """Test that priority order is applied to a file listing patent-office first."""
+        temp_path = tmp_path / "test.xml"
+        temp_path.write_bytes(epo_po_xml_bytes)
+        
+        result = extract_doc_numbers_from_file(temp_path)
+        assert result == ["111111", "222222"]
+    
+    def test_extract_from_file_snippets_with_declared_encoding(self, tmp_path: Path):
+        """Test that snippets in a file are decoded with the file's declared encoding."""
+        xml_content = """<?xml version="1.0" encoding="windows-1252"?>
+        <root><document-id format="epo"><doc-number>€111</doc-number></document-id></root>
+        <root><document-id format="epo"><doc-number>€222</doc-number></document-id></root>"""
+        
+        temp_path = tmp_path / "test.xml"
+        temp_path.write_text(xml_content, encoding='cp1252')
+        
+        result = extract_doc_numbers_from_file(temp_path)
+        assert result == ["€111", "€222"]
     
-    def test_extract_from_malformed_file(self):
+    def test_extract_from_undeclared_latin1_file(self, tmp_path: Path):
+        """Test that undeclared latin-1 files fall back to latin-1 decoding."""
+        xml_content = """<root>
+            <document-id format="epo">
+                <doc-number>111111</doc-number>
+                <country>café</country>
+            </document-id>
+        </root>"""
+        
+        temp_path = tmp_path / "test.xml"
+        temp_path.write_text(xml_content, encoding='latin-1')
+        
+        result = extract_doc_numbers_from_file(temp_path)
+        assert result == ["111111"]
+    
+    def test_extract_from_rewritten_file(self, tmp_path: Path):
+        """Test that cached results are not reused after the file changes."""
+        temp_path = tmp_path / "test.xml"
+        temp_path.write_text(
+            '<root><document-id format="epo"><doc-number>111111</doc-number></document-id></root>',
+            encoding='utf-8',
+        )
+        assert extract_doc_numbers_from_file(temp_path) == ["111111"]
+        
+        temp_path.write_text(
+            '<root><document-id format="epo"><doc-number>2222222</doc-number></document-id></root>',
+            encoding='utf-8',
+        )
+        assert extract_doc_numbers_from_file(temp_path) == ["2222222"]
+    
+    def test_cached_result_is_a_copy(self, tmp_path: Path):
+        """Test that mutating a returned list doesn't affect later calls."""
+        temp_path = tmp_path / "test.xml"
+        temp_path.write_text(
+            '<root><document-id format="epo"><doc-number>111111</doc-number></document-id></root>',
+            encoding='utf-8',
+        )
+        
+        extract_doc_numbers_from_file(temp_path).append("mutated")
+        assert extract_doc_numbers_from_file(temp_path) == ["111111"]
+        
+        extract_doc_numbers_from_file.cache_clear()
+        assert extract_doc_numbers_from_file(temp_path) == ["111111"]
+    
+    def test_extract_from_malformed_file(self, tmp_path: Path):
         """Test that malformed XML in file raises ValueError."""
-        with tempfile.NamedTemporaryFile(mode='w', encoding='utf-8', delete=False, suffix='.xml') as f:
-            f.write('<root><unclosed>')
-            temp_path = Path(f.name)
+        temp_path = tmp_path / "test.xml"
+        temp_path.write_text('<root><unclosed>', encoding='utf-8')
         
-        try:
-            with pytest.raises(ValueError, match="Failed to parse XML"):
-                extract_doc_numbers_from_file(temp_path)
-        finally:
-            temp_path.unlink()
+        with pytest.raises(ValueError, match="Failed to parse XML"):
+            extract_doc_numbers_from_file(temp_path)
     
     def test_extract_from_nonexistent_file(self):
         """Test that nonexistent file raises FileNotFoundError."""
         with pytest.raises(FileNotFoundError):
             extract_doc_numbers_from_file(Path("/nonexistent/file.xml"))
     
-    def test_extract_from_empty_file(self):
+    def test_extract_from_empty_file(self, tmp_path: Path):
         """Test that empty file raises ValueError."""
-        with tempfile.NamedTemporaryFile(mode='w', encoding='utf-8', delete=False, suffix='.xml') as f:
-            f.write('')
-            temp_path = Path(f.name)
+        temp_path = tmp_path / "test.xml"
+        temp_path.write_text('', encoding='utf-8')
         
-        try:
-            with pytest.raises(ValueError):
-                extract_doc_numbers_from_file(temp_path)
-        finally:
-            temp_path.unlink()
+        with pytest.raises(ValueError):
+            extract_doc_numbers_from_file(temp_path)
+
+
+@pytest.mark.xdist_group("fs")
+class TestExtractDocNumbersFromFiles:
+    """Tests for extract_doc_numbers_from_files function."""
+    
+    def _write_files(self, directory, count):
+        """Write count XML files, each with one epo and one patent-office doc-number."""
+        paths = []
+        for i in range(count):
+            path = directory / f"patent_{i}.xml"
+            path.write_text(f"""<?xml version="1.0"?>
+            <root>
+                <document-id format="patent-office">
+                    <doc-number>PO{i}</doc-number>
+                </document-id>
+                <document-id format="epo">
+                    <doc-number>EPO{i}</doc-number>
+                </document-id>
+            </root>""", encoding='utf-8')
+            paths.append(path)
+        return paths
+    
+    def test_extract_from_many_files_in_parallel(self, tmp_path: Path):
+        """Test that results from worker processes are keyed by path in input order."""
+        paths = self._write_files(tmp_path, 5)
+        
+        result = extract_doc_numbers_from_files(paths, workers=2)
+        
+        assert list(result) == paths
+        assert result[paths[3]] == ["EPO3", "PO3"]
+    
+    def test_extract_from_files_sequentially(self, tmp_path: Path):
+        """Test that workers=1 gives the same results without a process pool."""
+        paths = self._write_files(tmp_path, 3)
+        
+        assert extract_doc_numbers_from_files(paths, workers=1) == extract_doc_numbers_from_files(paths, workers=2)
+    
+    def test_extract_from_files_with_missing_file(self, tmp_path: Path):
+        """Test that a missing file raises FileNotFoundError from the pool."""
+        paths = self._write_files(tmp_path, 2) + [tmp_path / "missing.xml"]
+        
+        with pytest.raises(FileNotFoundError, match="File not found"):
+            extract_doc_numbers_from_files(paths, workers=2)